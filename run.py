@@ -3,10 +3,12 @@ HD Video Advertisement Player - H.264 Optimized
 ================================================
 
 Performance Optimizations:
-- H.264 hardware-accelerated video decoding (VAAPI/VDPAU/DXVA2)
+- H.264 hardware-accelerated video decoding (V4L2 M2M/NVDEC/Quick Sync)
 - Multi-threaded frame decoding for reduced CPU load
 - Zero-copy frame processing where possible
-- High-quality scaling with Qt SmoothTransformation
+- Video YUV -> RGB conversion and scaling on the GPU (OpenGL shader and
+  texture sampler), with OpenCV conversion/resize as the CPU fallback
+- High-quality OpenCV image scaling (area averaging down, Lanczos up)
 - Optimized A/V synchronization with adaptive frame dropping
 - Efficient memory management with frame caching
 - Qt rendering optimizations for smooth HD playback
@@ -17,23 +19,220 @@ CPU overhead by leveraging hardware acceleration and efficient algorithms.
 
 import sys
 import os
+import re
+import signal
 import socket
-import json
+import struct
 import argparse
+import logging
 from pathlib import Path
-from PyQt5.QtWidgets import QApplication, QLabel, QMainWindow, QGraphicsOpacityEffect
-from PyQt5.QtCore import QTimer, Qt, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve, QSocketNotifier
-from PyQt5.QtGui import QPixmap, QImage, QImageReader, QColorSpace
+from PyQt5.QtWidgets import QApplication, QLabel, QMainWindow, QGraphicsOpacityEffect, QOpenGLWidget, QStackedWidget
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, Qt, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve, QSocketNotifier
+from PyQt5 import sip
+from PyQt5.QtGui import (QPixmap, QImage, QImageReader, QColorSpace, QOpenGLContext, QOpenGLVersionProfile,
+                         QOpenGLShader, QOpenGLShaderProgram, QOpenGLTexture, QOpenGLPixelTransferOptions,
+                         QVector2D)
 import cv2
 import numpy as np
 from ffpyplayer.player import MediaPlayer
+from ffpyplayer.tools import get_codecs
 import time
+import threading
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
 
 
 # IPC Configuration
-IPC_SOCKET_PATH = '/tmp/video_player_ipc.sock'
+# Linux abstract-namespace socket: no file to stat/unlink, and the kernel drops
+# the name as soon as the owning process closes it (so it can never go stale)
+IPC_SOCKET_PATH = '\0video_player_ipc'
 IPC_PORT = 45678
 
+# IPC message: fixed header (command id, duration in seconds) followed by the
+# UTF-8 file path for PLAY. SOCK_SEQPACKET delivers each message whole.
+IPC_HEADER = struct.Struct('<Bi')
+IPC_COMMAND_IDS = {'PLAY': 1, 'STOP': 2, 'EXIT': 3, 'PING': 4}
+IPC_COMMAND_NAMES = {cmd_id: name for name, cmd_id in IPC_COMMAND_IDS.items()}
+IPC_MAX_MESSAGE = IPC_HEADER.size + 4096  # Header + PATH_MAX
+IPC_PEERCRED = struct.Struct('3i')  # struct ucred: pid, uid, gid
+
+# OpenGL constants used by the video surface (not exposed by PyQt's function wrappers)
+GL_COLOR_BUFFER_BIT = 0x4000
+GL_TRIANGLE_STRIP = 0x0005
+
+# Adaptive frame-drop threshold (in frame periods): tolerant on steady content,
+# tightened towards the minimum while a decode backlog persists
+DROP_THRESHOLD_MAX_FRAMES = 3.0
+DROP_THRESHOLD_MIN_FRAMES = 1.0
+DROP_BACKLOG_GAIN = 1.0  # How fast the threshold tightens per frame of average backlog
+BACKLOG_EMA_ALPHA = 0.1  # Smoothing of the per-frame backlog estimate
+
+# Seconds a hardware decoder gets to produce its first frame before falling back to CPU
+HW_DECODER_START_TIMEOUT = 2.0
+
+# PCI vendor IDs of the GPU behind a DRM render node
+PCI_VENDOR_INTEL = '0x8086'
+PCI_VENDOR_NVIDIA = '0x10de'
+
+# Hardware decoders that produced no frames in this process - not tried again
+failed_hw_decoders = set()
+
+# Consecutive undisplayable frames before playback of a file is given up
+MAX_CONVERSION_ERRORS = 10
+
+# Decoded video frame as separate YUV 4:2:0 planes (Y full size, U/V half size).
+# The planes may point straight into the decoder's buffer, so `image` holds the
+# owning ffpyplayer Image alive for as long as the frame is referenced.
+VideoFrame = namedtuple('VideoFrame', ['y', 'u', 'v', 'image'])
+
+
+class LatestFrame:
+    """
+    Hand-off slot for the newest decoded frame, shared by VideoThread and the GUI
+
+    The decoder overwrites a frame the GUI has not picked up yet instead of
+    queueing it, so only one notification is ever in flight and a slow repaint
+    drops stale frames rather than building up a backlog in the event queue.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frame = None
+
+    def put(self, frame):
+        """Publish a frame; returns False if it replaced one that was never shown"""
+        with self._lock:
+            was_empty = self._frame is None
+            self._frame = frame
+        return was_empty
+
+    def take(self):
+        """Return the newest frame (None if there is none) and empty the slot"""
+        with self._lock:
+            frame, self._frame = self._frame, None
+        return frame
+
+
+def compute_sync_action(pts, audio_pts, frame_period, drop_threshold):
+    """
+    A/V sync decision for one video frame - cubic "rubber band" correction
+
+    Returns (sleep_s, drop): how long to wait before showing the frame, and
+    whether the frame is more than drop_threshold seconds behind audio and
+    should be skipped instead of shown.
+    """
+    if audio_pts <= 0.0 or pts <= 0.0:
+        # No audio sync available, minimal sleep to avoid busy loop
+        return 0.0008, False
+
+    delay = pts - audio_pts
+
+    if delay < -drop_threshold:
+        # Too far behind audio - drop to catch up
+        return 0.0, True
+    if delay <= 0.0:
+        # Slightly behind - show immediately, no pacing
+        return 0.0, False
+
+    # Video ahead of audio: correction grows with the cube of the error, so it damps
+    # out near sync and pulls harder the further off we are. Never sleep past the
+    # audio clock and never stall for more than two frame periods at once.
+    ratio = delay / frame_period
+    sleep_s = ratio * ratio * ratio * frame_period
+    return min(sleep_s, delay, 2.0 * frame_period), False
+
+
+def enable_sync_jit():
+    """
+    JIT-compile compute_sync_action with numba, if it is installed
+
+    Only the GUI instance calls this - the short-lived --play/--stop/--exit
+    clients never import numba. The kernel is compiled here, up front,
+    instead of stalling the first video frame.
+    """
+    global compute_sync_action
+    try:
+        from numba import njit
+    except ImportError:  # numba is optional - the sync kernel then runs as plain Python
+        return
+    compute_sync_action = njit(cache=True)(compute_sync_action)
+    compute_sync_action(1.0, 1.0, 1.0 / 30, 0.1)
+
+
+def compute_drop_threshold(backlog_ema, frame_period):
+    """Frame-drop threshold in seconds for the current average backlog behind audio"""
+    frames = DROP_THRESHOLD_MAX_FRAMES / (1.0 + DROP_BACKLOG_GAIN * backlog_ema / frame_period)
+    return max(frames, DROP_THRESHOLD_MIN_FRAMES) * frame_period
+
+
+# BT.601 limited-range YUV -> RGB as a 3x4 affine matrix for cv2.transform
+# (same coefficients as the GL shader and OpenCV's I420 conversion)
+BT601_YUV2RGB = np.array([
+    [1.164, 0.0, 1.596],
+    [1.164, -0.392, -0.813],
+    [1.164, 2.017, 0.0],
+], dtype=np.float32)
+BT601_YUV2RGB = np.hstack((BT601_YUV2RGB, -BT601_YUV2RGB @ np.array([[16.0], [128.0], [128.0]], dtype=np.float32)))
+
+
+def _upsample_uv(U, V, H, W, out=None):
+    """Nearest-neighbour upsample of half-resolution chroma planes to H x W (into `out` if given)"""
+    if out is None:
+        out = (np.empty((H, W), np.uint8), np.empty((H, W), np.uint8))
+    Ustart, Vstart = out
+    for dy in (0, 1):
+        for dx in (0, 1):
+            # With odd H/W the odd-offset slices are one sample shorter than the plane
+            rows, cols = Ustart[dy::2, dx::2].shape
+            Ustart[dy::2, dx::2] = U[:rows, :cols]
+            Vstart[dy::2, dx::2] = V[:rows, :cols]
+    return Ustart, Vstart
+
+
+def detect_hw_decoder():
+    """
+    Pick a hardware H.264 decoder for this machine (None if there is none)
+
+    ffpyplayer cannot pass ffmpeg's -hwaccel option, so hardware decoding is
+    selected by naming a dedicated decoder as vcodec. Only decoders compiled
+    into this ffmpeg build are considered. macOS has no standalone
+    VideoToolbox decoder, so it always decodes on the CPU.
+    """
+    candidates = []
+    if sys.platform.startswith('linux'):
+        if os.path.exists('/dev/video10'):
+            candidates.append('h264_v4l2m2m')  # Raspberry Pi stateful decoder
+        vendor = drm_render_vendor()
+        if os.path.exists('/dev/nvidia0') and vendor in (PCI_VENDOR_NVIDIA, None):
+            candidates.append('h264_cuvid')  # NVDEC
+        if vendor == PCI_VENDOR_INTEL:
+            candidates.append('h264_qsv')  # Intel Quick Sync
+    elif sys.platform == 'win32':
+        # The GPU drivers install these runtimes; without them the decoders can't open
+        from ctypes.util import find_library
+        if find_library('nvcuvid'):
+            candidates.append('h264_cuvid')
+        if find_library('libmfxhw64') or find_library('libmfx64-gen'):
+            candidates.append('h264_qsv')
+    candidates = [name for name in candidates if name not in failed_hw_decoders]
+    if not candidates:
+        return None
+    try:
+        available = set(get_codecs(decode=True, video=True))
+    except Exception:
+        return None
+    return next((name for name in candidates if name in available), None)
+
+
+def drm_render_vendor():
+    """PCI vendor ID ('0x8086', ...) of the first DRM render node, None if unknown"""
+    try:
+        with open('/sys/class/drm/renderD128/device/vendor') as f:
+            return f.read().strip().lower()
+    except OSError:
+        return None
+
 
 class VideoThread(QThread):
     """
@@ -44,9 +243,10 @@ class VideoThread(QThread):
     - Multi-threaded frame processing
     - Synchronized audio playback
     - Efficient memory management
+    - YUV420 output (12 bpp) - RGB conversion happens at display time
     """
-    frame_ready = pyqtSignal(np.ndarray)
-    playback_finished = pyqtSignal(np.ndarray)
+    frame_ready = pyqtSignal()  # A new frame is waiting in `frames`
+    playback_finished = pyqtSignal()
 
     def __init__(self, video_path, duration=0):
         super().__init__()
@@ -54,44 +254,66 @@ class VideoThread(QThread):
         self.duration = duration
         self.running = True
         self.player = None
+        self.hw_decoder = detect_hw_decoder()
+        self.frames = LatestFrame()
 
     def run(self):
         """Play video with synchronized audio - QQ Player style smooth playback"""
         try:
             # Create MediaPlayer with H.264 hardware acceleration and optimized settings
             ff_opts = {
+                # Planar YUV420 output: half the bytes of RGB24 per frame, and no
+                # swscale RGB pass when the source is already yuv420p (typical H.264)
+                'out_fmt': 'yuv420p',
                 'paused': False,
                 'autoexit': False,
-                # Hardware acceleration for H.264 (reduces CPU load significantly)
                 'vcodec': 'h264',  # Prefer H.264 codec
-                'hwaccel': 'auto',  # Auto-detect hardware acceleration (VAAPI/VDPAU/DXVA2)
-                # Threading optimizations
-                'threads': '4',  # Multi-threaded decoding
-                'thread_type': 'frame',  # Frame-level threading for better performance
-                # High-quality output settings
-                'flags': 'low_delay',  # Low latency decoding
-                # NOTE: Removed 'flags2': 'fast' to avoid lower-quality decode shortcuts
                 # Frame dropping prevention
                 'framedrop': False,  # Don't drop frames for quality
+            }
+
+            # Options forwarded to libavcodec/libavformat/libswscale when they are opened
+            # (ff_opts only covers ffplay-level settings, decoder options must go here)
+            lib_opts = {
+                # Threading optimizations - frame+slice threading on every core
+                'threads': str(os.cpu_count() or 4),
+                'thread_type': 'frame+slice',
+                # No 'flags': 'low_delay' - libavcodec disables frame threading when it is set
+                # NOTE: Removed 'flags2': 'fast' to avoid lower-quality decode shortcuts
                 # Buffering optimizations
                 'analyzeduration': '1000000',  # 1 second analysis (faster startup)
                 'probesize': '5000000',  # 5MB probe size (balanced)
-                # High-quality scaling for RGB conversion (libswscale)
+                # High-quality scaling for pixel format conversion (libswscale)
                 'sws_flags': 'lanczos+accurate_rnd+full_chroma_int',  # Best chroma and scaling quality
             }
 
-            self.player = MediaPlayer(self.video_path, ff_opts=ff_opts)
+            # Hardware decoding (reduces CPU load significantly) via a dedicated decoder;
+            # its NV12 output is still handed to us as planar yuv420p (out_fmt above)
+            hw_decoder = self.hw_decoder
+            # ffpyplayer UTF-8 encodes str paths, bytes keep non-UTF-8 file names intact
+            source = os.fsencode(self.video_path)
+            if hw_decoder:
+                logger.info("Trying hardware decoder: %s", hw_decoder)
+                self.player = MediaPlayer(source, ff_opts=dict(ff_opts, vcodec=hw_decoder),
+                                          lib_opts=lib_opts)
+            else:
+                self.player = MediaPlayer(source, ff_opts=ff_opts, lib_opts=lib_opts)
 
             start_time = time.time()
-            last_frame = None
+            decoder_start_time = start_time
             frame_count = 0
+            superseded_count = 0
+            conversion_errors = 0
 
             # Performance tracking for smooth playback
-            last_pts = 0
             audio_pts = 0
-            behind_streak = 0
+            frame_period = None  # Read from the stream's frame rate on the first frame
+            dropped_count = 0
+            backlog_ema = 0.0
+            drop_threshold = 0.0
+            threshold_update_time = 0.0
 
-            print(f"Starting smooth playback: {self.video_path}")
+            logger.info("Starting smooth playback: %s", self.video_path)
 
             # Main playback loop - synchronized to audio
             while self.running:
@@ -99,20 +321,32 @@ class VideoThread(QThread):
                 if self.duration > 0:
                     elapsed = time.time() - start_time
                     if elapsed >= self.duration:
-                        print(f"Duration limit reached: {elapsed:.2f}s")
+                        logger.debug("Duration limit reached: %.2fs", elapsed)
                         break
 
                 # Get frame with timing info
                 frame_data, val = self.player.get_frame()
 
                 if val == 'eof':
-                    print("End of file reached")
+                    logger.debug("End of file reached")
                     break
                 elif val == 'paused':
                     time.sleep(0.01)
                     continue
 
                 if frame_data is None:
+                    if (hw_decoder and frame_period is None
+                            and time.time() - decoder_start_time >= HW_DECODER_START_TIMEOUT):
+                        # A decoder that fails to open (no device, busy, unsupported
+                        # profile) never errors out, it just produces nothing. The
+                        # duration limit keeps counting from the original start, so
+                        # the wait is not added to the slot the client scheduled
+                        logger.info("Hardware decoder %s produced no frames, using CPU decoding", hw_decoder)
+                        failed_hw_decoders.add(hw_decoder)
+                        hw_decoder = None
+                        self.player.close_player()
+                        self.player = MediaPlayer(source, ff_opts=ff_opts, lib_opts=lib_opts)
+                        continue
                     # No frame ready yet, small wait
                     time.sleep(0.002)
                     continue
@@ -126,54 +360,75 @@ class VideoThread(QThread):
                 # Get audio/video sync info
                 audio_pts = self.player.get_pts()
 
-                # Convert image to numpy array (RGB format) - OPTIMIZED
+                if frame_period is None:
+                    # Stream info is only complete once the decoder produced a frame
+                    metadata = self.player.get_metadata()
+                    rate_num, rate_den = metadata.get('frame_rate') or (0, 0)
+                    frame_period = rate_den / rate_num if rate_num > 0 and rate_den > 0 else 1.0 / 30
+                    if hw_decoder:
+                        logger.info("Hardware decoding enabled: %s", hw_decoder)
+                    logger.debug("Decoder: %s (%s, threads: %s)", metadata,
+                                 hw_decoder or ff_opts['vcodec'], lib_opts['threads'])
+
+                # Track how far video is running behind audio, and re-derive the
+                # drop threshold from that average once per second
+                if audio_pts and pts:
+                    backlog = max(0.0, audio_pts - pts)
+                    backlog_ema += BACKLOG_EMA_ALPHA * (backlog - backlog_ema)
+                now = time.time()
+                if now - threshold_update_time >= 1.0:
+                    drop_threshold = compute_drop_threshold(backlog_ema, frame_period)
+                    threshold_update_time = now
+
+                # A/V sync: Calculate delay based on audio position (OPTIMIZED)
+                sleep_time, drop = compute_sync_action(
+                    float(pts or 0.0), float(audio_pts or 0.0), frame_period, drop_threshold)
+                if drop:
+                    # Too far behind audio - skip this frame without displaying it
+                    dropped_count += 1
+                    continue
+                if sleep_time > 0:
+                    time.sleep(sleep_time)
+
+                # Wrap YUV420 planes as numpy arrays - OPTIMIZED
                 try:
                     width, height = img.get_size()
-                    buf = img.to_bytearray()[0]
-                    # Single copy operation - more efficient memory usage
-                    # Using np.frombuffer with copy for thread safety
-                    frame_rgb = np.frombuffer(buf, dtype=np.uint8).reshape(height, width, 3).copy()
-
-                    # Emit frame for display (no additional copies)
-                    last_frame = frame_rgb
-                    self.frame_ready.emit(frame_rgb)
+                    # Direct views of the decoded planes (ffpyplayer only copies when the
+                    # line size carries alignment padding)
+                    y_buf, u_buf, v_buf = img.to_memoryview()[:3]
+                    chroma_width = (width + 1) // 2
+                    chroma_height = (height + 1) // 2
+                    # Each decoded Image owns its own buffers, so views are thread safe
+                    frame = VideoFrame(
+                        np.frombuffer(y_buf, dtype=np.uint8).reshape(height, width),
+                        np.frombuffer(u_buf, dtype=np.uint8).reshape(chroma_height, chroma_width),
+                        np.frombuffer(v_buf, dtype=np.uint8).reshape(chroma_height, chroma_width),
+                        img,
+                    )
+
+                    # Hand the frame to the GUI (no additional copies); it is only
+                    # notified if it already took the previous one
+                    if self.frames.put(frame):
+                        self.frame_ready.emit()
+                    else:
+                        superseded_count += 1
                     frame_count += 1
+                    conversion_errors = 0
 
                 except Exception as e:
-                    print(f"Frame conversion error: {e}")
+                    conversion_errors += 1
+                    logger.debug("Frame conversion error: %s", e)
+                    if conversion_errors >= MAX_CONVERSION_ERRORS:
+                        logger.error("Giving up on %s after %d frame conversion errors (%s)",
+                                     self.video_path, conversion_errors, e)
+                        break
                     continue
 
-                # A/V sync: Calculate delay based on audio position (OPTIMIZED)
-                if audio_pts > 0 and pts > 0:
-                    delay = pts - audio_pts
-
-                    # Smooth sync adjustment with adaptive frame drop for performance
-                    if delay > 0.002:  # Video ahead of audio (>2ms)
-                        # Sleep proportionally but cap to reduce jitter
-                        sleep_time = min(delay * 0.8, 0.04)  # 80% of delay, max 40ms
-                        time.sleep(sleep_time)
-                        behind_streak = 0
-                    elif delay < -0.015:  # Video behind audio (>15ms)
-                        behind_streak += 1
-                        if behind_streak >= 3:
-                            # Skip frame to catch up and reduce CPU load
-                            continue
-                    else:
-                        # In sync - minimal sleep to yield CPU
-                        behind_streak = 0
-                        time.sleep(0.0005)
-                else:
-                    # No audio sync available, minimal sleep to avoid busy loop
-                    time.sleep(0.0008)
-
-                last_pts = pts
-
-            print(f"Playback finished: {frame_count} frames, {time.time() - start_time:.2f}s")
+            logger.info("Playback finished: %d frames (%d dropped, %d superseded), %.2fs",
+                        frame_count, dropped_count, superseded_count, time.time() - start_time)
 
         except Exception as e:
-            print(f"Playback error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Playback error: %s", e)
 
         finally:
             # Clean shutdown
@@ -184,11 +439,7 @@ class VideoThread(QThread):
                     pass
                 self.player = None
 
-            # Send last frame
-            if last_frame is not None:
-                self.playback_finished.emit(last_frame)
-            else:
-                self.playback_finished.emit(np.array([]))
+            self.playback_finished.emit()
 
     def stop(self):
         """Stop playback"""
@@ -201,64 +452,407 @@ class VideoThread(QThread):
             self.player = None
 
 
-class IPCServerThread(QThread):
-    """Thread for handling IPC socket server"""
+class IPCServer(QObject):
+    """
+    IPC socket server driven by the Qt event loop
+
+    The listening socket and each accepted client are watched with a
+    QSocketNotifier, so no thread has to poll for connections and
+    shutdown takes effect immediately.
+    """
     command_received = pyqtSignal(dict)
 
-    def __init__(self):
-        super().__init__()
-        self.running = True
+    def __init__(self, parent=None):
+        super().__init__(parent)
         self.server_socket = None
+        self.notifier = None
+        self.clients = {}  # fd -> (client socket, read notifier)
 
-    def run(self):
-        """Run IPC server"""
+    def start(self):
+        """Start IPC server"""
         try:
             # Create Unix domain socket
-            if os.path.exists(IPC_SOCKET_PATH):
-                os.remove(IPC_SOCKET_PATH)
-
-            self.server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
             self.server_socket.bind(IPC_SOCKET_PATH)
             self.server_socket.listen(5)
-            self.server_socket.settimeout(1.0)  # Timeout for checking self.running
+            self.server_socket.setblocking(False)
 
-            print(f"IPC Server listening on {IPC_SOCKET_PATH}")
+            self.notifier = QSocketNotifier(self.server_socket.fileno(), QSocketNotifier.Read, self)
+            self.notifier.activated.connect(self.on_connection_ready)
 
-            while self.running:
-                try:
-                    client_socket, _ = self.server_socket.accept()
-                    data = client_socket.recv(4096).decode('utf-8')
-
-                    if data:
-                        try:
-                            command = json.loads(data)
-                            print(f"Received command: {command}")
-                            self.command_received.emit(command)
-
-                            # Send acknowledgment
-                            client_socket.send(b"OK")
-                        except json.JSONDecodeError as e:
-                            print(f"Invalid JSON: {e}")
-                            client_socket.send(b"ERROR")
-
-                    client_socket.close()
-                except socket.timeout:
-                    continue
-                except Exception as e:
-                    if self.running:
-                        print(f"IPC error: {e}")
+            print(f"IPC Server listening on @{IPC_SOCKET_PATH[1:]}")
 
         except Exception as e:
             print(f"IPC server error: {e}")
+            self.stop()
+
+    def on_connection_ready(self, _fd):
+        """Accept a pending client and wait for its command without blocking"""
+        try:
+            client_socket, _ = self.server_socket.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        except Exception as e:
+            print(f"IPC error: {e}")
+            return
+
+        client_socket.setblocking(False)
+        notifier = QSocketNotifier(client_socket.fileno(), QSocketNotifier.Read, self)
+        notifier.activated.connect(self.on_client_ready)
+        self.clients[client_socket.fileno()] = (client_socket, notifier)
+
+    def on_client_ready(self, fd):
+        """Read one command from a client, acknowledge it and dispatch it"""
+        client_socket, notifier = self.clients.pop(fd, (None, None))
+        if client_socket is None:
+            return
+        notifier.setEnabled(False)
+        notifier.deleteLater()
+
+        command = None
+        try:
+            # Abstract sockets have no file permissions - check who is talking to us
+            creds = client_socket.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, IPC_PEERCRED.size)
+            sender_pid, sender_uid, _ = IPC_PEERCRED.unpack(creds)
+            if sender_uid not in (os.getuid(), 0):
+                print(f"Rejected IPC connection from PID {sender_pid} (UID {sender_uid})")
+                return
+
+            # SOCK_SEQPACKET silently cuts longer messages - refuse those instead
+            data, _, msg_flags, _ = client_socket.recvmsg(IPC_MAX_MESSAGE)
+
+            if data:
+                command = None if msg_flags & socket.MSG_TRUNC else decode_ipc_command(data)
+                if command is not None:
+                    print(f"Received command from PID {sender_pid}: {command}")
+
+                    # Send acknowledgment before handling, so the client is not
+                    # held while the GUI switches content
+                    client_socket.send(b"OK")
+                else:
+                    print(f"Invalid IPC message: {data!r}")
+                    client_socket.send(b"ERROR")
+        except Exception as e:
+            print(f"IPC error: {e}")
         finally:
-            if self.server_socket:
-                self.server_socket.close()
-            if os.path.exists(IPC_SOCKET_PATH):
-                os.remove(IPC_SOCKET_PATH)
+            client_socket.close()
+
+        if command is not None:
+            self.command_received.emit(command)
 
     def stop(self):
         """Stop IPC server"""
-        self.running = False
+        for client_socket, notifier in self.clients.values():
+            notifier.setEnabled(False)
+            client_socket.close()
+        self.clients.clear()
+
+        if self.notifier:
+            self.notifier.setEnabled(False)
+            self.notifier = None
+        if self.server_socket:
+            self.server_socket.close()
+            self.server_socket = None
+
+
+class YUVVideoWidget(QOpenGLWidget):
+    """
+    OpenGL surface for YUV420 video frames
+
+    The Y/U/V planes are uploaded as three single-channel textures and
+    converted to RGB in a fragment shader. Scaling to the screen happens in
+    the GPU's bilinear texture sampler, so the CPU neither resizes frames nor
+    builds a QPixmap for them.
+    """
+    unavailable = pyqtSignal()
+
+    VERTEX_SHADER = """
+        attribute highp vec2 position;
+        attribute highp vec2 texcoord;
+        varying highp vec2 v_texcoord;
+        void main() {
+            gl_Position = vec4(position, 0.0, 1.0);
+            v_texcoord = texcoord;
+        }
+    """
+
+    # BT.601 limited range, same conversion as cv2.COLOR_YUV2RGB_I420
+    FRAGMENT_SHADER = """
+        varying highp vec2 v_texcoord;
+        uniform sampler2D tex_y;
+        uniform sampler2D tex_u;
+        uniform sampler2D tex_v;
+        uniform mediump float opacity;
+        void main() {
+            mediump float y = 1.164 * (texture2D(tex_y, v_texcoord).r - 0.0625);
+            mediump float u = texture2D(tex_u, v_texcoord).r - 0.5;
+            mediump float v = texture2D(tex_v, v_texcoord).r - 0.5;
+            mediump vec3 rgb = vec3(y + 1.596 * v, y - 0.392 * u - 0.813 * v, y + 2.017 * u);
+            gl_FragColor = vec4(rgb * opacity, 1.0);
+        }
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.gl = None
+        self.program = None
+        self.textures = []
+        self.texture_size = None
+        self.frame = None
+        self.frame_dirty = False
+        self.opacity = 1.0
+        self.failed = False
+        # Planes are tightly packed, rows are not padded to 4 bytes
+        self.transfer_options = QOpenGLPixelTransferOptions()
+        self.transfer_options.setAlignment(1)
+
+    @staticmethod
+    def is_supported():
+        """Check that an OpenGL context can be created on this display"""
+        return QOpenGLContext().create()
+
+    def set_frame(self, frame):
+        """Show a VideoFrame (uploaded on the next paint)"""
+        self.frame = frame
+        self.frame_dirty = True
+        self.update()
+
+    def set_opacity(self, opacity):
+        """Fade level applied in the shader (follows the window's fade animation)"""
+        self.opacity = float(opacity)
+        self.update()
+
+    def initializeGL(self):
+        """Resolve GL functions and build the YUV → RGB shader"""
+        try:
+            context = self.context()
+            if context.isOpenGLES():
+                self.gl = context.versionFunctions()
+            else:
+                profile = QOpenGLVersionProfile()
+                profile.setVersion(2, 0)
+                self.gl = context.versionFunctions(profile)
+            if self.gl is None:
+                raise RuntimeError("OpenGL 2.0 / ES 2.0 functions not available")
+            self.gl.initializeOpenGLFunctions()
+
+            self.program = QOpenGLShaderProgram(self)
+            if not self.program.addShaderFromSourceCode(QOpenGLShader.Vertex, self.VERTEX_SHADER):
+                raise RuntimeError(self.program.log())
+            if not self.program.addShaderFromSourceCode(QOpenGLShader.Fragment, self.FRAGMENT_SHADER):
+                raise RuntimeError(self.program.log())
+            self.program.bindAttributeLocation('position', 0)
+            self.program.bindAttributeLocation('texcoord', 1)
+            if not self.program.link():
+                raise RuntimeError(self.program.log())
+
+        except Exception as e:
+            print(f"OpenGL video rendering unavailable: {e}")
+            self.failed = True
+            self.unavailable.emit()
+
+    def upload_frame(self):
+        """Upload the pending frame's planes, recreating textures on size change"""
+        height, width = self.frame.y.shape
+        if self.texture_size != (width, height):
+            for texture in self.textures:
+                texture.destroy()
+            self.textures = []
+            chroma_height, chroma_width = self.frame.u.shape
+            for plane_width, plane_height in ((width, height), (chroma_width, chroma_height),
+                                              (chroma_width, chroma_height)):
+                texture = QOpenGLTexture(QOpenGLTexture.Target2D)
+                texture.setFormat(QOpenGLTexture.LuminanceFormat)
+                texture.setSize(plane_width, plane_height)
+                texture.setMinMagFilters(QOpenGLTexture.Linear, QOpenGLTexture.Linear)
+                texture.setWrapMode(QOpenGLTexture.ClampToEdge)
+                texture.allocateStorage(QOpenGLTexture.Luminance, QOpenGLTexture.UInt8)
+                self.textures.append(texture)
+            self.texture_size = (width, height)
+
+        for texture, plane in zip(self.textures, (self.frame.y, self.frame.u, self.frame.v)):
+            texture.setData(QOpenGLTexture.Luminance, QOpenGLTexture.UInt8,
+                            sip.voidptr(np.ascontiguousarray(plane)), self.transfer_options)
+
+    def paintGL(self):
+        """Draw the current frame letterboxed to the widget, scaled by the GPU"""
+        if self.gl is None or self.failed:
+            return
+        self.gl.glClearColor(0.0, 0.0, 0.0, 1.0)
+        self.gl.glClear(GL_COLOR_BUFFER_BIT)
+        if self.frame is None:
+            return
+
+        if self.frame_dirty:
+            self.upload_frame()
+            self.frame_dirty = False
+
+        # Fit inside the widget with aspect preserved
+        width, height = self.texture_size
+        ratio = self.devicePixelRatioF()
+        view_width = int(self.width() * ratio)
+        view_height = int(self.height() * ratio)
+        scale = min(view_width / width, view_height / height)
+        draw_width = int(width * scale)
+        draw_height = int(height * scale)
+        self.gl.glViewport((view_width - draw_width) // 2, (view_height - draw_height) // 2,
+                           draw_width, draw_height)
+
+        self.program.bind()
+        for unit, (name, texture) in enumerate(zip(('tex_y', 'tex_u', 'tex_v'), self.textures)):
+            texture.bind(unit)
+            self.program.setUniformValue(name, unit)
+        self.program.setUniformValue('opacity', self.opacity)
+
+        # Fullscreen quad (triangle strip); texture rows run top to bottom
+        self.program.enableAttributeArray(0)
+        self.program.enableAttributeArray(1)
+        self.program.setAttributeArray(0, [QVector2D(-1, -1), QVector2D(1, -1), QVector2D(-1, 1), QVector2D(1, 1)])
+        self.program.setAttributeArray(1, [QVector2D(0, 1), QVector2D(1, 1), QVector2D(0, 0), QVector2D(1, 0)])
+        self.gl.glDrawArrays(GL_TRIANGLE_STRIP, 0, 4)
+        self.program.disableAttributeArray(0)
+        self.program.disableAttributeArray(1)
+        self.program.release()
+
+
+class ImageLoaderSignals(QObject):
+    """Signals for ImageLoader (QRunnable itself cannot emit)"""
+    loaded = pyqtSignal(int, object)  # request token, QImage or None on failure
+
+
+class ImageLoader(QRunnable):
+    """
+    Load and scale an image for full-screen display on a pool thread
+
+    Decoding and resizing large images can take hundreds of milliseconds,
+    so this runs off the GUI thread; only the QPixmap conversion and
+    setPixmap are left for the main thread.
+    """
+
+    def __init__(self, token, image_path, screen_width, screen_height, is_background):
+        super().__init__()
+        self.token = token
+        self.image_path = image_path
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.is_background = is_background
+        self.signals = ImageLoaderSignals()
+
+    def run(self):
+        """Decode, scale and emit the display-ready QImage"""
+        q_image = None
+        try:
+            q_image = self.load()
+        except Exception as e:
+            print(f"Error displaying image {self.image_path}: {e}")
+        self.signals.loaded.emit(self.token, q_image)
+
+    # Formats handed straight to Qt's decoder (cv2.imread has no animation
+    # support and WebP availability depends on how OpenCV was built)
+    QT_DECODED_SUFFIXES = ('.gif', '.webp')
+
+    def load(self):
+        # cv2.imdecode sniffs the actual format (data/background.jpg is really
+        # a PNG) and applies EXIF orientation, like QImageReader's autoTransform.
+        # The file is read by Python: cv2.imread crashes on str paths holding
+        # surrogate escapes (file names that aren't valid UTF-8)
+        pixels, is_bgr = None, False
+        if Path(self.image_path).suffix.lower() not in self.QT_DECODED_SUFFIXES:
+            try:
+                encoded = np.fromfile(self.image_path, dtype=np.uint8)
+            except OSError:
+                encoded = None
+            if encoded is not None and encoded.size:
+                pixels = self.decode_bgr(encoded)
+            is_bgr = pixels is not None
+        if pixels is None:
+            pixels = self.read_with_qt()
+        if pixels is None:
+            print(f"Error displaying image {self.image_path}: failed to load")
+            return None
+        height, width = pixels.shape[:2]
+
+        screen_width, screen_height = self.screen_width, self.screen_height
+        if self.is_background:
+            # Fill screen while preserving aspect, then center-crop (high quality)
+            scale = max(screen_width / width, screen_height / height)
+        else:
+            # Fit inside the screen with aspect preserved (high quality)
+            scale = min(screen_width / width, screen_height / height)
+        new_width = max(1, round(width * scale))
+        new_height = max(1, round(height * scale))
+
+        # Area averaging for downscales (no aliasing), Lanczos for upscales
+        interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LANCZOS4
+        scaled = np.empty((new_height, new_width, 3), dtype=np.uint8)
+        cv2.resize(pixels, (new_width, new_height), dst=scaled, interpolation=interpolation)
+
+        if self.is_background:
+            x = max(0, (new_width - screen_width) // 2)
+            y = max(0, (new_height - screen_height) // 2)
+            scaled = scaled[y:y + screen_height, x:x + screen_width]
+
+        # Write the final RGB pixels straight into the QImage's own buffer,
+        # so there is no extra copy once the arrays go away
+        height, width = scaled.shape[:2]
+        result = QImage(width, height, QImage.Format_RGB888)
+        bits = result.bits()
+        bits.setsize(result.sizeInBytes())
+        target = np.frombuffer(bits, dtype=np.uint8).reshape(height, result.bytesPerLine())
+        target = target[:, :width * 3].reshape(height, width, 3)
+        if is_bgr:
+            cv2.cvtColor(scaled, cv2.COLOR_BGR2RGB, dst=target)
+        else:
+            np.copyto(target, scaled)
+
+        # Set sRGB color space for proper color reproduction
+        try:
+            result.setColorSpace(QColorSpace.SRgb)
+        except Exception:
+            pass  # Gracefully handle older Qt versions
+        return result
+
+    @staticmethod
+    def decode_bgr(encoded):
+        """Decode with OpenCV to 8-bit BGR, transparent areas composited over black"""
+        if encoded[:2].tobytes() == b'\xff\xd8':
+            # JPEG has no alpha; IMREAD_COLOR also applies EXIF orientation on
+            # every OpenCV version (IMREAD_UNCHANGED skips it before 5.x)
+            return cv2.imdecode(encoded, cv2.IMREAD_COLOR)
+        pixels = cv2.imdecode(encoded, cv2.IMREAD_UNCHANGED)
+        if pixels is None:
+            return None
+        if pixels.dtype == np.uint16:
+            pixels = (pixels >> 8).astype(np.uint8)
+        elif pixels.dtype != np.uint8:
+            pixels = np.clip(pixels * 255.0, 0, 255).astype(np.uint8)
+        if pixels.ndim == 2:
+            return cv2.cvtColor(pixels, cv2.COLOR_GRAY2BGR)
+        if pixels.shape[2] == 4:
+            # The label shows a black background, so premultiplying by alpha is
+            # the same as drawing the image over it (as the ARGB pixmap used to be)
+            bgr, alpha = pixels[:, :, :3], pixels[:, :, 3]
+            if alpha.min() == 255:
+                return np.ascontiguousarray(bgr)
+            return cv2.multiply(bgr, cv2.merge((alpha, alpha, alpha)), scale=1.0 / 255)
+        return pixels
+
+    def read_with_qt(self):
+        """Decode with QImageReader; returns an RGB array (alpha composited over black) or None"""
+        reader = QImageReader(self.image_path)
+        reader.setAutoTransform(True)
+        q_image = reader.read()
+        if q_image.isNull():
+            return None
+
+        # Premultiplied RGB is the image drawn over black
+        q_image = q_image.convertToFormat(QImage.Format_RGBA8888_Premultiplied)
+        width, height = q_image.width(), q_image.height()
+        bits = q_image.constBits()
+        bits.setsize(q_image.sizeInBytes())
+        rgba = np.frombuffer(bits, dtype=np.uint8).reshape(height, q_image.bytesPerLine())
+        # Copy out so the array does not outlive q_image's buffer
+        return rgba[:, :width * 4].reshape(height, width, 4)[:, :, :3].copy()
 
 
 class AdPlayerWindow(QMainWindow):
@@ -271,6 +865,11 @@ class AdPlayerWindow(QMainWindow):
         self.is_transitioning = False
         self.pending_command = None
         self.is_playing_media = False  # Track if actively playing media
+        self._display_token = 0  # Identifies the latest display request
+        self._pending_image = None
+        # Screen-ready background pixmaps: path -> (screen width, screen height, mtime, pixmap).
+        # One entry per path, replaced when the screen size or the file changes
+        self._bg_pixmap_cache = {}
 
         # Setup window with optimized rendering for smooth playback
         self.setWindowTitle('HD Video Player - H.264 Optimized')
@@ -291,7 +890,24 @@ class AdPlayerWindow(QMainWindow):
         self.label.setAlignment(Qt.AlignCenter)
         self.label.setStyleSheet("background-color: black;")
         self.label.setScaledContents(False)  # Manual scaling for control
-        self.setCentralWidget(self.label)
+
+        # Screen size used for scaling, kept current via geometryChanged
+        screen = QApplication.primaryScreen()
+        self._screen_w, self._screen_h = screen.geometry().width(), screen.geometry().height()
+        screen.geometryChanged.connect(self.on_screen_geometry_changed)
+
+        # GPU video surface; without a usable OpenGL context videos go through the label
+        self.video_widget = None
+        if YUVVideoWidget.is_supported():
+            self.video_widget = YUVVideoWidget(self)
+            self.video_widget.unavailable.connect(self.on_video_widget_unavailable, Qt.QueuedConnection)
+
+        # Stack the image label and the video surface, showing one at a time
+        self.stack = QStackedWidget(self)
+        self.stack.addWidget(self.label)
+        if self.video_widget is not None:
+            self.stack.addWidget(self.video_widget)
+        self.setCentralWidget(self.stack)
 
         # Setup opacity effect for smooth transitions
         self.opacity_effect = QGraphicsOpacityEffect(self.label)
@@ -303,20 +919,36 @@ class AdPlayerWindow(QMainWindow):
         self.fade_animation.setDuration(150)
         self.fade_animation.setEasingCurve(QEasingCurve.InOutQuad)
         self.fade_animation.finished.connect(self.on_fade_finished)
+        if self.video_widget is not None:
+            # Graphics effects don't apply to the GL surface, it fades in its shader
+            self.fade_animation.valueChanged.connect(self.video_widget.set_opacity)
 
         # Timer for media display
         self.media_timer = QTimer()
         self.media_timer.timeout.connect(self.on_media_timeout)
 
         # Start IPC server
-        self.ipc_thread = IPCServerThread()
-        self.ipc_thread.command_received.connect(self.handle_ipc_command)
-        self.ipc_thread.start()
+        self.ipc_server = IPCServer(self)
+        self.ipc_server.command_received.connect(self.handle_ipc_command)
+        self.ipc_server.start()
 
         # Delay background display until window is fully initialized
         if self.background_image and os.path.exists(self.background_image):
             QTimer.singleShot(100, self.display_initial_background)
 
+    def on_screen_geometry_changed(self, geometry):
+        """Track the new screen size and drop anything scaled for the old one"""
+        self._screen_w, self._screen_h = geometry.width(), geometry.height()
+        self._bg_pixmap_cache.clear()
+        if hasattr(self, '_cached_video_size'):
+            delattr(self, '_cached_video_size')
+
+    def screen_size(self):
+        """Cached screen size, falling back to the label size if it is not known"""
+        if self._screen_w <= 0 or self._screen_h <= 0:
+            return self.label.size().width(), self.label.size().height()
+        return self._screen_w, self._screen_h
+
     def display_initial_background(self):
         """Display initial background after window is fully initialized"""
         if self.background_image and os.path.exists(self.background_image):
@@ -342,60 +974,74 @@ class AdPlayerWindow(QMainWindow):
         elif cmd_type == 'EXIT':
             self.close()
 
-    def display_image(self, image_path, duration, is_background=False):
-        """Display image with smart full-screen sizing"""
+    def display_image(self, image_path, duration, is_background=False, fade_in=False):
+        """Display image with smart full-screen sizing (loaded and scaled off the GUI thread)"""
         try:
-            reader = QImageReader(image_path)
-            reader.setAutoTransform(True)
-            q_image = reader.read()
-            if q_image.isNull():
-                print(f"Error displaying image {image_path}: failed to load")
-                return
-
-            # Set sRGB color space for proper color reproduction
-            try:
-                q_image.setColorSpace(QColorSpace.SRgb)
-            except Exception:
-                pass  # Gracefully handle older Qt versions
+            screen_width, screen_height = self.screen_size()
 
-            # Get screen size - use actual screen geometry
-            from PyQt5.QtWidgets import QApplication
-            screen = QApplication.primaryScreen()
-            screen_geometry = screen.geometry()
-            screen_width = screen_geometry.width()
-            screen_height = screen_geometry.height()
+            if duration > 0 and not is_background:
+                self.is_playing_media = True  # Mark as actively playing
 
-            # Fallback to label size if needed
-            if screen_width <= 0 or screen_height <= 0:
-                screen_size = self.label.size()
-                screen_width = screen_size.width()
-                screen_height = screen_size.height()
+            # Newer display requests supersede this one while it is loading
+            self._display_token += 1
 
+            # Backgrounds never change between fades - reuse the scaled pixmap
+            cache_key = None
             if is_background:
-                # Fill screen while preserving aspect, then center-crop (high quality)
-                scaled = q_image.scaled(screen_width, screen_height, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-                x = max(0, (scaled.width() - screen_width) // 2)
-                y = max(0, (scaled.height() - screen_height) // 2)
-                q_image = scaled.copy(x, y, screen_width, screen_height)
-            else:
-                # Fit inside the screen with aspect preserved (high quality)
-                q_image = q_image.scaled(screen_width, screen_height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                try:
+                    cache_key = (image_path, screen_width, screen_height, os.path.getmtime(image_path))
+                except OSError:
+                    pass
+                entry = self._bg_pixmap_cache.get(image_path)
+                if cache_key is not None and entry is not None and entry[:3] == cache_key[1:]:
+                    self.label.setPixmap(entry[3])
+                    self.stack.setCurrentWidget(self.label)
+                    if duration > 0:
+                        self.media_timer.start(int(duration * 1000))
+                    if fade_in:
+                        self.fade_in()
+                    return
+
+            self._pending_image = (duration, is_background, fade_in, cache_key)
+            loader = ImageLoader(self._display_token, image_path, screen_width, screen_height, is_background)
+            loader.signals.loaded.connect(self.on_image_loaded)
+            QThreadPool.globalInstance().start(loader)
+
+        except Exception as e:
+            print(f"Error displaying image {image_path}: {e}")
+            if fade_in:
+                self.fade_in()
 
+    def on_image_loaded(self, token, q_image):
+        """Show an image prepared by ImageLoader, unless a newer request replaced it"""
+        if token != self._display_token:
+            return
+        duration, is_background, fade_in, cache_key = self._pending_image
+
+        if q_image is not None:
             pixmap = QPixmap.fromImage(q_image)
+            if cache_key is not None:
+                path, width, height, mtime = cache_key
+                self._bg_pixmap_cache[path] = (width, height, mtime, pixmap)
             self.label.setPixmap(pixmap)
+            self.stack.setCurrentWidget(self.label)
 
             # Set timer if duration specified
             if duration > 0:
                 self.media_timer.start(int(duration * 1000))
-                if not is_background:
-                    self.is_playing_media = True  # Mark as actively playing
+        elif not is_background:
+            # Nothing is showing and no timer will end it, so don't block STOP
+            self.is_playing_media = False
 
-        except Exception as e:
-            print(f"Error displaying image {image_path}: {e}")
+        if fade_in:
+            self.fade_in()
 
     def display_video(self, video_path, duration):
         """Display video with smart full-screen sizing"""
         try:
+            # Drop any image still loading in the background
+            self._display_token += 1
+
             # Stop any running video thread
             if self.video_thread and self.video_thread.isRunning():
                 self.video_thread.stop()
@@ -407,9 +1053,14 @@ class AdPlayerWindow(QMainWindow):
             if hasattr(self, '_cached_display_size'):
                 delattr(self, '_cached_display_size')
 
+            # Show the GPU surface (cleared, so the previous video's last frame doesn't flash)
+            if self.video_widget is not None:
+                self.video_widget.set_frame(None)
+                self.stack.setCurrentWidget(self.video_widget)
+
             # Create and start video thread
             self.video_thread = VideoThread(video_path, duration)
-            self.video_thread.frame_ready.connect(self.update_frame)
+            self.video_thread.frame_ready.connect(self.on_frame_ready)
             self.video_thread.playback_finished.connect(self.on_video_finished)
             try:
                 self.video_thread.setPriority(QThread.HighPriority)
@@ -421,63 +1072,105 @@ class AdPlayerWindow(QMainWindow):
         except Exception as e:
             print(f"Error displaying video {video_path}: {e}")
 
+    def on_frame_ready(self):
+        """Display the newest frame from the video thread, skipping any it replaced"""
+        frame = self.video_thread.frames.take() if self.video_thread else None
+        if frame is not None:
+            self.update_frame(frame)
+
     def update_frame(self, frame):
         """Update display with new video frame - OPTIMIZED for smooth playback with HD quality"""
+        # GPU path: YUV → RGB and scaling happen in the shader
+        if self.video_widget is not None:
+            self.video_widget.set_frame(frame)
+            return
+
         try:
-            # Get frame dimensions
-            height, width, channel = frame.shape
+            y_plane, u_plane, v_plane = frame.y, frame.u, frame.v
+
+            height, width = y_plane.shape
 
             # Check if video resolution changed or cache doesn't exist
             cache_key = f"{width}x{height}"
             if not hasattr(self, '_cached_video_size') or self._cached_video_size != cache_key:
-                from PyQt5.QtWidgets import QApplication
-                screen = QApplication.primaryScreen()
-                screen_geometry = screen.geometry()
-                screen_width = screen_geometry.width()
-                screen_height = screen_geometry.height()
-
-                # Fallback to label size if needed
-                if screen_width <= 0 or screen_height <= 0:
-                    screen_size = self.label.size()
-                    screen_width = screen_size.width()
-                    screen_height = screen_size.height()
+                screen_width, screen_height = self.screen_size()
 
                 # Calculate optimal scaling to fit full screen while maintaining aspect ratio
                 scale = min(screen_width / width, screen_height / height)
                 new_width = int(width * scale)
                 new_height = int(height * scale)
 
-                # Cache dimensions and scaling mode for this video resolution
+                # Cache dimensions for this video resolution
                 self._cached_video_size = cache_key
                 self._cached_display_size = (new_width, new_height)
-                # ALWAYS use SmoothTransformation for maximum quality (removes downscaling artifacts)
-                self._cached_transform_mode = Qt.SmoothTransformation
 
-                print(f"Video size adjusted: {width}x{height} → {new_width}x{new_height} (screen: {screen_width}x{screen_height}, scale: {scale:.2f})")
+                # Display buffer reused for every frame at this resolution, with a QImage
+                # that wraps it in place (the buffer must outlive the shallow QImage)
+                self._display_buf = np.empty((new_height, new_width, 3), dtype=np.uint8)
+                self._display_qimage = QImage(self._display_buf.data, new_width, new_height,
+                                              3 * new_width, QImage.Format_RGB888)
+
+                # Set sRGB color space for proper color reproduction (avoids washed-out colors)
+                try:
+                    self._display_qimage.setColorSpace(QColorSpace.SRgb)
+                except Exception:
+                    pass  # Gracefully handle older Qt versions without full color space support
+
+                # Input-side buffers, so the conversion below allocates nothing per frame
+                if width % 2 or height % 2:
+                    self._yuv444_buf = np.empty((height, width, 3), dtype=np.uint8)
+                else:
+                    self._i420_buf = np.empty((height * 3 // 2, width), dtype=np.uint8)
+                    flat = self._i420_buf.reshape(-1)
+                    y_size, uv_size = height * width, (height // 2) * (width // 2)
+                    self._i420_planes = (
+                        flat[:y_size].reshape(height, width),
+                        flat[y_size:y_size + uv_size].reshape(height // 2, width // 2),
+                        flat[y_size + uv_size:].reshape(height // 2, width // 2),
+                    )
+                same_size = (new_width, new_height) == (width, height)
+                self._rgb_buf = None if same_size else np.empty((height, width, 3), dtype=np.uint8)
+
+                logger.info("Video size adjusted: %dx%d → %dx%d (screen: %dx%d, scale: %.2f)",
+                            width, height, new_width, new_height, screen_width, screen_height, scale)
             else:
                 new_width, new_height = self._cached_display_size
 
-            # Direct conversion to QImage - zero-copy when possible
-            bytes_per_line_src = 3 * width
-            # Use the frame data buffer directly without intermediate copies
-            q_image_src = QImage(frame.data, width, height, bytes_per_line_src, QImage.Format_RGB888)
-
-            # Set sRGB color space for proper color reproduction (avoids washed-out colors)
-            try:
-                q_image_src.setColorSpace(QColorSpace.SRgb)
-            except Exception:
-                pass  # Gracefully handle older Qt versions without full color space support
+            # Already at display size - convert straight into the display buffer
+            frame_rgb = self._display_buf if self._rgb_buf is None else self._rgb_buf
+            if width % 2 or height % 2:
+                # I420 conversion needs even sizes - upsample chroma and convert 4:4:4 instead
+                yuv = self._yuv444_buf
+                np.copyto(yuv[:, :, 0], y_plane)
+                _upsample_uv(u_plane, v_plane, height, width, out=(yuv[:, :, 1], yuv[:, :, 2]))
+                cv2.transform(yuv, BT601_YUV2RGB, dst=frame_rgb)
+            else:
+                # Pack planes into the I420 buffer and convert YUV → RGB in one OpenCV pass
+                for dst_plane, src_plane in zip(self._i420_planes, (y_plane, u_plane, v_plane)):
+                    np.copyto(dst_plane, src_plane)
+                cv2.cvtColor(self._i420_buf, cv2.COLOR_YUV2RGB_I420, dst=frame_rgb)
 
-            # High-quality scaling using cached transformation mode
-            transform_mode = getattr(self, '_cached_transform_mode', Qt.SmoothTransformation)
-            q_image_scaled = q_image_src.scaled(new_width, new_height, Qt.KeepAspectRatio, transform_mode)
+            if self._rgb_buf is not None:
+                # Bilinear scaling to display size, written in place
+                cv2.resize(frame_rgb, (new_width, new_height), dst=self._display_buf,
+                           interpolation=cv2.INTER_LINEAR)
 
             # Convert to pixmap and display
-            pixmap = QPixmap.fromImage(q_image_scaled)
+            pixmap = QPixmap.fromImage(self._display_qimage)
             self.label.setPixmap(pixmap)
 
         except Exception as e:
-            print(f"Error updating frame: {e}")
+            logger.warning("Error updating frame: %s", e)
+
+    def on_video_widget_unavailable(self):
+        """OpenGL failed to initialize - render video through the label instead"""
+        print("Falling back to CPU video rendering")
+        widget = self.video_widget
+        self.video_widget = None
+        self.fade_animation.valueChanged.disconnect(widget.set_opacity)
+        self.stack.setCurrentWidget(self.label)
+        self.stack.removeWidget(widget)
+        widget.deleteLater()
 
     def play_media(self, filepath, duration):
         """Play media file with smooth transition"""
@@ -504,10 +1197,10 @@ class AdPlayerWindow(QMainWindow):
         else:
             # Direct play if already faded
             if is_image:
-                self.display_image(filepath, duration, is_background=False)
+                self.display_image(filepath, duration, is_background=False, fade_in=True)
             else:
                 self.display_video(filepath, duration)
-            self.fade_in()
+                self.fade_in()
 
     def stop_playback(self, return_to_background=True):
         """Stop current playback and optionally return to background"""
@@ -537,13 +1230,16 @@ class AdPlayerWindow(QMainWindow):
         self.is_playing_media = False  # Media playback finished
         print("Media duration completed")
 
-    def on_video_finished(self, last_frame):
+    def on_video_finished(self):
         """Called when video playback finishes - hold last frame cleanly"""
-        # Don't return to background automatically
-        # Display the last frame as a static image to prevent freezing
+        # Don't return to background automatically; the label (or GL widget)
+        # still shows the last frame, so nothing needs to be redrawn
         self.is_playing_media = False  # Media playback finished
-        if last_frame is not None and last_frame.size > 0:
-            self.update_frame(last_frame)
+        if self.video_widget is not None:
+            frame_shown = self.video_widget.frame is not None
+        else:
+            frame_shown = hasattr(self, '_cached_video_size')
+        if frame_shown:
             print("Video finished - holding last frame")
         else:
             print("Video finished - no frames captured")
@@ -579,17 +1275,21 @@ class AdPlayerWindow(QMainWindow):
             if cmd['type'] == 'play':
                 # Switch to new content
                 if cmd['is_image']:
-                    self.display_image(cmd['file'], cmd['duration'], is_background=False)
+                    self.display_image(cmd['file'], cmd['duration'], is_background=False, fade_in=True)
                 else:
                     self.display_video(cmd['file'], cmd['duration'])
-                self.fade_in()
+                    self.fade_in()
             elif cmd['type'] == 'background':
                 # Return to background
-                self.display_image(self.background_image, 0, is_background=True)
-                self.fade_in()
+                self.display_image(self.background_image, 0, is_background=True, fade_in=True)
 
         self.is_transitioning = False
 
+    def resizeEvent(self, event):
+        """Drop cached backgrounds scaled for the previous size"""
+        self._bg_pixmap_cache.clear()
+        super().resizeEvent(event)
+
     def keyPressEvent(self, event):
         """Handle key press"""
         if event.key() == Qt.Key_Q or event.key() == Qt.Key_Escape:
@@ -598,9 +1298,7 @@ class AdPlayerWindow(QMainWindow):
     def closeEvent(self, event):
         """Clean up on close"""
         # Stop IPC server
-        if self.ipc_thread and self.ipc_thread.isRunning():
-            self.ipc_thread.stop()
-            self.ipc_thread.wait()
+        self.ipc_server.stop()
 
         # Stop video thread
         if self.video_thread and self.video_thread.isRunning():
@@ -610,15 +1308,39 @@ class AdPlayerWindow(QMainWindow):
         event.accept()
 
 
+def encode_ipc_command(command):
+    """Pack a command dict into one binary IPC message"""
+    message = IPC_HEADER.pack(IPC_COMMAND_IDS[command['command']], int(command.get('duration', 0)))
+    # fsencode round-trips file names that aren't valid UTF-8 (surrogateescape)
+    message += os.fsencode(command.get('file', ''))
+    if len(message) > IPC_MAX_MESSAGE:
+        raise ValueError(f"file path too long for IPC ({len(message) - IPC_HEADER.size} bytes)")
+    return message
+
+
+def decode_ipc_command(data):
+    """Unpack one binary IPC message into a command dict (None if malformed)"""
+    if len(data) < IPC_HEADER.size:
+        return None
+    cmd_id, duration = IPC_HEADER.unpack_from(data)
+    cmd_type = IPC_COMMAND_NAMES.get(cmd_id)
+    if cmd_type is None:
+        return None
+    if cmd_type != 'PLAY':
+        return {'command': cmd_type}
+    filepath = os.fsdecode(data[IPC_HEADER.size:])
+    return {'command': cmd_type, 'file': filepath, 'duration': duration}
+
+
 def send_ipc_command(command):
     """Send command to running instance via IPC"""
     try:
-        client_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client_socket = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
         client_socket.settimeout(2.0)
         client_socket.connect(IPC_SOCKET_PATH)
 
         # Send command
-        client_socket.send(json.dumps(command).encode('utf-8'))
+        client_socket.send(encode_ipc_command(command))
 
         # Wait for response
         response = client_socket.recv(1024).decode('utf-8')
@@ -631,15 +1353,72 @@ def send_ipc_command(command):
 
 
 def is_instance_running():
-    """Check if instance is already running"""
-    return os.path.exists(IPC_SOCKET_PATH)
+    """Check if instance is already running (connects to the IPC socket)"""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    probe.settimeout(0.5)
+    try:
+        probe.connect(IPC_SOCKET_PATH)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+# Command lines of player processes (same pattern `pgrep -f` used)
+# argv[0] of a Python interpreter (python, python3, python3.11, ...)
+PYTHON_EXECUTABLE_PATTERN = re.compile(rb'python[0-9.]*')
+
+
+def is_player_argv(argv):
+    """Whether an argv list (bytes) is a GUI instance: python ... run.py ... --start"""
+    if not argv or not PYTHON_EXECUTABLE_PATTERN.fullmatch(os.path.basename(argv[0])):
+        return False
+    return any(os.path.basename(arg) == b'run.py' for arg in argv[1:]) and b'--start' in argv
+
+
+def find_player_pids():
+    """List PIDs of other GUI instances by scanning /proc (no pgrep fork/exec)"""
+    current_pid = os.getpid()
+    pids = []
+    for entry in os.scandir('/proc'):
+        if not entry.name.isdigit() or int(entry.name) == current_pid:
+            continue
+        try:
+            with open(f'/proc/{entry.name}/cmdline', 'rb') as f:
+                argv = f.read().split(b'\0')[:-1]  # Each argument is NUL-terminated
+        except OSError:
+            continue  # Process exited meanwhile or is not ours to read
+        # Match the real argv, so --play clients and shells or wrappers whose
+        # command string merely mentions run.py are left alone
+        if is_player_argv(argv):
+            pids.append(int(entry.name))
+    return pids
+
+
+def is_pid_alive(pid):
+    """Check whether a process still exists (an unreaped zombie counts as gone)"""
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            stat = f.read()
+    except OSError:
+        return False
+    # The state field follows the parenthesised command name
+    return stat[stat.rindex(b')') + 2:][:1] != b'Z'
+
+
+def wait_until(condition, timeout, interval=0.005):
+    """Poll condition() until it is true or timeout seconds pass; returns whether it became true"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+    return True
 
 
 def kill_existing_instance():
     """Kill existing instance"""
-    import subprocess
-    import time
-
     try:
         # First try to send exit command via IPC
         if is_instance_running():
@@ -647,30 +1426,22 @@ def kill_existing_instance():
             try:
                 command = {'command': 'EXIT'}
                 send_ipc_command(command)
-                time.sleep(0.01)  # Wait for graceful shutdown
+                # Graceful shutdown is done once the server has closed its socket
+                wait_until(lambda: not is_instance_running(), timeout=0.5)
             except:
                 pass
 
         # If still running, force kill (excluding current process)
-        current_pid = os.getpid()
-        result = subprocess.run(
-            ["pgrep", "-f", "python.*run.py"],
-            capture_output=True,
-            text=True
-        )
-
-        if result.returncode == 0:
-            pids = result.stdout.strip().split('\n')
-            for pid in pids:
-                if pid and pid.strip() and int(pid) != current_pid:
-                    print(f"Killing process {pid}...")
-                    subprocess.run(["kill", "-9", pid], check=False)
-
-        # Clean up socket
-        if os.path.exists(IPC_SOCKET_PATH):
-            os.remove(IPC_SOCKET_PATH)
-
-        time.sleep(0.01)  # Wait for cleanup
+        pids = find_player_pids()
+        for pid in pids:
+            print(f"Killing process {pid}...")
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+        # Wait for killed processes to go away (the kernel releases their socket)
+        wait_until(lambda: not any(is_pid_alive(pid) for pid in pids), timeout=0.5)
 
     except Exception as e:
         print(f"Error killing instance: {e}")
@@ -683,9 +1454,18 @@ def main():
     parser.add_argument('--stop', action='store_true', help='Stop playback')
     parser.add_argument('--exit', action='store_true', help='Exit GUI')
     parser.add_argument('--single-instance', action='store_true', help='Enable single instance mode')
+    parser.add_argument('--verbose', action='store_true', help='Log playback details')
 
     args = parser.parse_args()
 
+    # File names that aren't valid UTF-8 are printed back as their original bytes
+    sys.stdout.reconfigure(errors='surrogateescape')
+
+    # Per-frame diagnostics go through logging, quiet unless asked for. Only this
+    # module's logger gets the verbose level, library loggers stay at WARNING
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    logger.setLevel(logging.DEBUG if args.verbose else logging.WARNING)
+
     # Handle --start command
     if args.start:
         # Kill existing instance if single-instance mode
@@ -698,6 +1478,8 @@ def main():
         QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
         QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
 
+        enable_sync_jit()
+
         # Start new GUI instance
         app = QApplication(sys.argv)
         window = AdPlayerWindow(background_image=args.start)
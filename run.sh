@@ -153,7 +153,6 @@ case "$COMMAND" in
         GUI_PID=$!
 
         # Actively wait for IPC readiness instead of a fixed sleep
-        SOCKET="/tmp/video_player_ipc.sock"
         READY_WAIT_SECS=15
         start_ts=$(date +%s)
 
@@ -164,16 +163,15 @@ case "$COMMAND" in
                 exit 1
             fi
 
-            # Socket present and accepting connections?
-            if [ -S "$SOCKET" ]; then
-                if $PYTHON_CMD - <<'PY'
-import socket, json, sys
-SOCK = "/tmp/video_player_ipc.sock"
-s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            # Socket accepting connections? (abstract socket, nothing on disk to test)
+            if $PYTHON_CMD - <<'PY'
+import socket, struct, sys
+SOCK = "\0video_player_ipc"
+s = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
 s.settimeout(0.5)
 try:
     s.connect(SOCK)
-    s.send(json.dumps({"command": "PING"}).encode("utf-8"))
+    s.send(struct.pack("<Bi", 4, 0))  # PING
     try:
         _ = s.recv(2)
     except Exception:
@@ -187,10 +185,9 @@ finally:
     except Exception:
         pass
 PY
-                then
-                    echo "GUI ready (IPC up)"
-                    break
-                fi
+            then
+                echo "GUI ready (IPC up)"
+                break
             fi
 
             # Timeout handling